@@ -1,5 +1,5 @@
 from mcs.main import MedicalCoderSwarm
-import json
+import orjson
 
 if __name__ == "__main__":
     # Example patient case
@@ -23,4 +23,4 @@ if __name__ == "__main__":
 
     swarm.run(task=patient_case)
 
-    print(json.dumps(swarm.to_dict()))
+    print(orjson.dumps(swarm.to_dict()).decode())
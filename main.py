@@ -1,17 +1,56 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional
-from uuid import uuid4
 
+import orjson
+import xxhash
+import zstandard
+from apscheduler.executors.pool import (
+    ThreadPoolExecutor as APSThreadPoolExecutor,
+)
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from cachetools import TTLCache
 from fastapi import (
-    BackgroundTasks,
     Depends,
     FastAPI,
     HTTPException,
+    Query,
+    Request,
+    Response,
 )
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
-from pydantic import BaseModel, Field
-from sqlalchemy import JSON, Column, Integer, String, create_engine
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    ValidationError,
+)
+from sqlalchemy import (
+    Column,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    update,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from uuid_utils import uuid7
 
 from mcs.main import MedicalCoderSwarm
 
@@ -20,42 +59,299 @@ app = FastAPI(
     title="Medical Coder Swarm API",
     description="Production-grade API for managing and running Medical Coder Swarms with complete tracking capabilities.",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
+
+_REPORTS_DIR = "reports"
+_SWARM_KW = {"output_folder_path": _REPORTS_DIR}
+
+# Idle swarms kept for reuse inside each swarm worker process.
+SWARM_INSTANCES = queue.Queue()
+
+
+def _fill_swarm_pool():
+    """
+    Pre-builds a swarm in each new worker process so its first run skips
+    initialization. A failure here is only logged; the run builds its
+    own swarm instead.
+    """
+    try:
+        SWARM_INSTANCES.put(MedicalCoderSwarm(**_SWARM_KW))
+    except Exception as e:
+        logger.error("Could not pre-build a swarm: {}", e)
+
+
+# Swarm runs are CPU-bound, so single runs and batches alike fan out
+# across processes. Workers come from a forkserver rather than a plain
+# fork, since this process already runs threads whose locks a forked
+# child could inherit held. The pool is per server process, so lower
+# SWARM_PROCESSES if the app is ever run under several server workers.
+SWARM_PROCESSES = int(
+    os.getenv("SWARM_PROCESSES", str(os.cpu_count() or 1))
+)
+SWARM_PROCS = ProcessPoolExecutor(
+    max_workers=SWARM_PROCESSES,
+    mp_context=multiprocessing.get_context("forkserver"),
+    initializer=_fill_swarm_pool,
 )
 
 # Database setup
 DATABASE_URL = "sqlite:///./medical_coder.db"
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+READ_DATABASE_URL = (
+    "sqlite:///file:./medical_coder.db?mode=ro&uri=true"
+)
+
+# SQLite allows a single writer at a time, so writes go through a
+# one-connection pool while reads share a pool sized to the host.
+write_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=1,
+    max_overflow=0,
+)
+read_engine = create_engine(
+    READ_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=os.cpu_count() or 1,
+)
+
+
+@event.listens_for(write_engine, "connect")
+@event.listens_for(read_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection: WAL journaling so readers never
+    block the writer, relaxed fsyncs, a busy timeout and a larger cache.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+@event.listens_for(write_engine, "connect")
+def disable_pysqlite_transactions(
+    dbapi_connection, connection_record
+):
+    """
+    Stop pysqlite from emitting its own deferred BEGIN so the writer
+    controls transaction start itself.
+    """
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(write_engine, "begin")
+def begin_immediate(conn):
+    """
+    Take the write lock up front instead of upgrading from a read lock
+    at commit time, which is what surfaces SQLITE_BUSY under load.
+    """
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+WriteSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=write_engine
 )
-SessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=read_engine
 )
 Base = declarative_base()
 
+# zstd contexts are not thread-safe, so each thread keeps its own pair.
+_zstd = threading.local()
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def compress_output(output: dict) -> bytes:
+    """
+    Encodes a swarm output as zstd-compressed JSON for storage.
+    """
+    if not hasattr(_zstd, "compressor"):
+        _zstd.compressor = zstandard.ZstdCompressor(level=3)
+    return _zstd.compressor.compress(orjson.dumps(output))
+
+
+def is_compressed(data) -> bool:
+    # Rows written before outputs were compressed hold plain JSON text.
+    return isinstance(data, bytes) and data.startswith(ZSTD_MAGIC)
+
+
+def decompress_output(data: bytes) -> dict:
+    """
+    Decodes a stored swarm output back into a dictionary.
+    """
+    if not is_compressed(data):
+        return orjson.loads(data)
+    if not hasattr(_zstd, "decompressor"):
+        _zstd.decompressor = zstandard.ZstdDecompressor()
+    return orjson.loads(_zstd.decompressor.decompress(data))
+
 
 class RunRecord(Base):
     __tablename__ = "runs"
 
     id = Column(Integer, primary_key=True, index=True)
     run_id = Column(String, unique=True, index=True, nullable=False)
-    patient_id = Column(String, index=True, nullable=False)
-    output = Column(JSON, nullable=False)
+    patient_id = Column(String, nullable=False)
+    output = Column(LargeBinary, nullable=False)
+
+    __table_args__ = (
+        Index("ix_runs_patient_created", "patient_id", "id"),
+    )
+
+    @property
+    def output_dict(self) -> dict:
+        return decompress_output(self.output)
 
 
-Base.metadata.create_all(bind=engine)
+class RunStatus(Base):
+    """
+    Batch runs that have no stored output yet: "pending" until the batch
+    saves them, or "failed" with the reason if they never will be.
+    """
+
+    __tablename__ = "run_status"
+
+    run_id = Column(String, primary_key=True)
+    patient_id = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    error = Column(String, nullable=True)
+
+
+Base.metadata.create_all(bind=write_engine)
+# create_all skips tables that already exist, so add any new indexes
+for index in RunRecord.__table__.indexes:
+    index.create(bind=write_engine, checkfirst=True)
+
+# Stored outputs larger than this are streamed from SQLite instead of
+# being loaded and decoded in one piece.
+STREAM_OUTPUT_THRESHOLD = 1024 * 1024
+BLOB_CHUNK_SIZE = 64 * 1024
+
+
+def stream_run_output(record_id: int, run_id: str, patient_id: str):
+    """
+    Yields a run as JSON, reading its output with SQLite incremental
+    BLOB I/O and decompressing it chunk by chunk.
+    """
+    connection = read_engine.raw_connection()
+    try:
+        # The generator may resume on different threads, so it gets its
+        # own decompressor rather than the thread-local one.
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        header = orjson.dumps(
+            {"run_id": run_id, "patient_id": patient_id}
+        )
+        yield header[:-1] + b',"output":'
+        with connection.driver_connection.blobopen(
+            RunRecord.__tablename__,
+            "output",
+            record_id,
+            readonly=True,
+        ) as blob:
+            chunk = blob.read(BLOB_CHUNK_SIZE)
+            if not chunk.startswith(ZSTD_MAGIC):
+                # Legacy JSON text is already the encoded output.
+                decompressor = None
+            while chunk:
+                if decompressor:
+                    chunk = decompressor.decompress(chunk)
+                yield chunk
+                chunk = blob.read(BLOB_CHUNK_SIZE)
+        yield b"}"
+    finally:
+        connection.close()
+
+
+# Batch jobs are kept in memory. The scheduler's job store calls run on
+# the event loop, so a database-backed store would stall every request
+# whenever it waited on the writer; and one-off jobs leave the store as
+# soon as they start, so persisting them protected very little.
+scheduler = AsyncIOScheduler(
+    jobstores={"default": MemoryJobStore()},
+    executors={"default": APSThreadPoolExecutor(16)},
+)
 
 
-# Dependency for database session
-def get_db():
-    db = SessionLocal()
+# Dependency for read-only database sessions
+def get_read_db():
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
         db.close()
 
 
+# Cache of serialized /history/ responses, keyed by ("run_id", id) or
+# ("patient_id", id). Patient entries are dropped whenever that patient
+# gets a new run; run entries never change once written. The cache is
+# bounded by the total size of the cached bodies, not the entry count.
+HISTORY_CACHE_BYTES = 64 * 1024 * 1024
+HISTORY_CACHE = TTLCache(
+    maxsize=HISTORY_CACHE_BYTES,
+    ttl=60,
+    getsizeof=lambda entry: len(entry[0]),
+)
+HISTORY_CACHE_LOCK = threading.Lock()
+# Bumped on every invalidation so a read that raced a write does not
+# cache what it fetched before the write landed.
+history_version = 0
+
+
+def invalidate_history(patient_ids) -> None:
+    global history_version
+    with HISTORY_CACHE_LOCK:
+        history_version += 1
+        for patient_id in patient_ids:
+            HISTORY_CACHE.pop(("patient_id", patient_id), None)
+
+
+def etag_response(
+    request: Request, body: bytes, etag: str
+) -> Response:
+    """
+    Returns the JSON body with its ETag, or a bare 304 when the client
+    already holds the same version.
+    """
+    headers = {"ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=body, media_type="application/json", headers=headers
+    )
+
+
+def cache_history(
+    request: Request, key: tuple, payload, version: int
+) -> Response:
+    """
+    Serializes a history payload and caches it, unless a write has
+    invalidated the cache since `version` was read or the body alone
+    exceeds the cache budget.
+    """
+    body = orjson.dumps(payload)
+    etag = f'"{xxhash.xxh3_64_hexdigest(body)}"'
+    with HISTORY_CACHE_LOCK:
+        if (
+            version == history_version
+            and len(body) <= HISTORY_CACHE_BYTES
+        ):
+            HISTORY_CACHE[key] = (body, etag)
+    return etag_response(request, body, etag)
+
+
 # Models
 class PatientCase(BaseModel):
+    model_config = ConfigDict(
+        extra="ignore", str_strip_whitespace=True
+    )
+
     patient_id: str = Field(
         ..., description="Unique identifier for the patient."
     )
@@ -67,6 +363,17 @@ class PatientCase(BaseModel):
     )
 
 
+# Built once so batch bodies are validated straight from JSON bytes.
+PATIENT_CASES_ADAPTER = TypeAdapter(List[PatientCase])
+# The batch endpoint reads the raw body, so its OpenAPI request schema is
+# supplied by hand. PatientCase itself is registered as a component by
+# the /run/ endpoint.
+PATIENT_CASES_SCHEMA = PATIENT_CASES_ADAPTER.json_schema(
+    ref_template="#/components/schemas/{model}"
+)
+PATIENT_CASES_SCHEMA.pop("$defs", None)
+
+
 class RunResponse(BaseModel):
     run_id: str = Field(
         ..., description="Unique identifier for the run."
@@ -76,6 +383,27 @@ class RunResponse(BaseModel):
     )
 
 
+class BatchResponse(BaseModel):
+    job_id: str = Field(
+        ..., description="Identifier of the scheduled batch job."
+    )
+    run_ids: List[str] = Field(
+        ..., description="Run IDs assigned to each case, in order."
+    )
+
+
+class RunStatusResponse(BaseModel):
+    run_id: str = Field(
+        ..., description="Unique identifier for the run."
+    )
+    status: str = Field(
+        ..., description="One of 'pending', 'completed' or 'failed'."
+    )
+    error: Optional[str] = Field(
+        None, description="Why the run failed, if it did."
+    )
+
+
 class RunQuery(BaseModel):
     run_id: Optional[str] = Field(
         None, description="Run ID to fetch a specific run."
@@ -86,134 +414,365 @@ class RunQuery(BaseModel):
     )
 
 
-@app.post(
-    "/run/",
-    response_model=RunResponse,
-    summary="Run a single medical coding task",
-)
-def run_task(
-    patient_case: PatientCase, db: Session = Depends(get_db)
-):
+def _do_swarm(patient_case: PatientCase) -> dict:
     """
-    Runs a single medical coding task for the given patient case.
+    Runs a pooled swarm for a single patient case, returning its output.
     """
-    logger.info("Starting a new medical coding task.")
-    run_id = str(uuid4())
+    try:
+        swarm = SWARM_INSTANCES.get_nowait()
+    except queue.Empty:
+        swarm = MedicalCoderSwarm(**_SWARM_KW)
 
     try:
-        swarm = MedicalCoderSwarm(
+        swarm.reset(
             patient_id=patient_case.patient_id,
             max_loops=patient_case.max_loops,
             patient_documentation=patient_case.patient_documentation,
-            output_folder_path="reports",
         )
 
         # Run the swarm
         swarm.run(task=patient_case.patient_documentation)
-        output = swarm.to_dict()
+        return swarm.to_dict()
+    finally:
+        SWARM_INSTANCES.put(swarm)
 
-        # Save run details
-        run_record = RunRecord(
-            run_id=run_id,
-            patient_id=patient_case.patient_id,
-            output=output,
+
+def _save_run(run_id: str, patient_id: str, output: dict) -> None:
+    """
+    Persists a single run through the writer pool.
+    """
+    with WriteSessionLocal() as db:
+        db.execute(
+            insert(RunRecord).values(
+                run_id=run_id,
+                patient_id=patient_id,
+                output=compress_output(output),
+            )
         )
-        db.add(run_record)
         db.commit()
-        db.refresh(run_record)
+    invalidate_history([patient_id])
 
-        logger.info(
-            f"Task completed successfully with run_id={run_id}."
-        )
-        return RunResponse(run_id=run_id, output=output)
 
-    except Exception as e:
-        logger.error(f"Error occurred while running the task: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="An error occurred while processing the task.",
+def _save_runs(rows: List[dict]) -> None:
+    """
+    Persists a batch of runs in a single writer transaction and clears
+    their pending status.
+    """
+    with WriteSessionLocal() as db:
+        db.execute(
+            insert(RunRecord),
+            [
+                {**row, "output": compress_output(row["output"])}
+                for row in rows
+            ],
         )
+        db.execute(
+            delete(RunStatus).where(
+                RunStatus.run_id.in_([row["run_id"] for row in rows])
+            )
+        )
+        db.commit()
+    invalidate_history({row["patient_id"] for row in rows})
 
 
-@app.post(
-    "/run/batch/",
-    response_model=List[RunResponse],
-    summary="Run batched medical coding tasks",
-)
-def run_batch(
-    patient_cases: List[PatientCase],
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-):
+def _mark_pending(run_ids: List[str], patient_ids: List[str]) -> None:
     """
-    Runs multiple medical coding tasks in batch mode.
+    Records every run of a newly scheduled batch as pending.
     """
-    logger.info("Starting a batch of medical coding tasks.")
-    responses = []
+    if not run_ids:
+        return
+    with WriteSessionLocal() as db:
+        db.execute(
+            insert(RunStatus),
+            [
+                {
+                    "run_id": run_id,
+                    "patient_id": patient_id,
+                    "status": "pending",
+                }
+                for run_id, patient_id in zip(run_ids, patient_ids)
+            ],
+        )
+        db.commit()
 
-    def process_batch(patient_case):
-        try:
-            run_id = str(uuid4())
-            swarm = MedicalCoderSwarm(
-                patient_id=patient_case.patient_id,
-                max_loops=patient_case.max_loops,
-                patient_documentation=patient_case.patient_documentation,
-                output_folder_path="reports",
+
+def _mark_failed(errors: dict) -> None:
+    """
+    Marks batch runs as failed, keyed by run ID with the error message.
+    """
+    with WriteSessionLocal() as db:
+        for run_id, error in errors.items():
+            db.execute(
+                update(RunStatus)
+                .where(RunStatus.run_id == run_id)
+                .values(status="failed", error=error)
             )
+        db.commit()
 
-            # Run the swarm
-            swarm.run(task=patient_case.patient_documentation)
-            output = swarm.to_dict()
 
-            # Save run details
-            run_record = RunRecord(
-                run_id=run_id,
-                patient_id=patient_case.patient_id,
-                output=output,
-            )
-            db.add(run_record)
-            db.commit()
-            db.refresh(run_record)
+def process_batch(
+    run_ids: List[str], patient_cases: List[dict]
+) -> None:
+    """
+    Scheduled job that runs a batch across the process pool, stores
+    every successful run in one transaction and marks the rest failed.
+    """
+    futures = [
+        SWARM_PROCS.submit(_do_swarm, PatientCase(**case))
+        for case in patient_cases
+    ]
 
-            responses.append(
-                RunResponse(run_id=run_id, output=output)
+    rows = []
+    errors = {}
+    for run_id, case, future in zip(run_ids, patient_cases, futures):
+        try:
+            output = future.result()
+        except Exception as e:
+            logger.error(
+                "Error occurred while processing batch task for patient_id={}: {}",
+                case["patient_id"],
+                e,
             )
-            logger.info(
-                f"Task completed successfully for patient_id={patient_case.patient_id} with run_id={run_id}."
+            errors[run_id] = f"Swarm run failed: {e}"
+            continue
+
+        rows.append(
+            {
+                "run_id": run_id,
+                "patient_id": case["patient_id"],
+                "output": output,
+            }
+        )
+        logger.debug(
+            "Task completed successfully for patient_id={} with run_id={}.",
+            case["patient_id"],
+            run_id,
+        )
+
+    # Save run details for the whole batch at once
+    if rows:
+        try:
+            _save_runs(rows)
+        except Exception as e:
+            logger.error(
+                "Error occurred while saving batch runs {}: {}",
+                [row["run_id"] for row in rows],
+                e,
             )
+            for row in rows:
+                errors[row["run_id"]] = f"Saving the run failed: {e}"
 
+    if errors:
+        try:
+            _mark_failed(errors)
         except Exception as e:
             logger.error(
-                f"Error occurred while processing batch task for patient_id={patient_case.patient_id}: {e}"
+                "Could not record failed batch runs {}: {}",
+                list(errors),
+                e,
             )
 
-    for case in patient_cases:
-        background_tasks.add_task(process_batch, case)
 
-    return responses
+@app.on_event("startup")
+def fail_interrupted_runs():
+    """
+    Batch jobs only live in memory, so runs still pending from a previous
+    process will never finish; mark them failed.
+    """
+    with WriteSessionLocal() as db:
+        db.execute(
+            update(RunStatus)
+            .where(RunStatus.status == "pending")
+            .values(
+                status="failed",
+                error="Interrupted by a server restart.",
+            )
+        )
+        db.commit()
+
+
+@app.on_event("startup")
+def configure_logging():
+    """
+    Hands log records to a background writer so handlers never block on
+    log I/O or the sink lock. Runs in every server worker process.
+    """
+    logger.remove()
+    logger.add(
+        "medical_coder_api.log",
+        rotation="1 MB",
+        retention="7 days",
+        level="INFO",
+        enqueue=True,
+        serialize=True,
+        backtrace=False,
+        diagnose=False,
+    )
+
+
+@app.on_event("startup")
+def start_scheduler():
+    scheduler.start()
+
+
+@app.on_event("shutdown")
+def stop_scheduler():
+    scheduler.shutdown(wait=False)
+
+
+@app.post(
+    "/run/",
+    response_class=ORJSONResponse,
+    responses={200: {"model": RunResponse}},
+    summary="Run a single medical coding task",
+)
+async def run_task(patient_case: PatientCase):
+    """
+    Runs a single medical coding task for the given patient case.
+    """
+    logger.info("Starting a new medical coding task.")
+    run_id = str(uuid7())
+    loop = asyncio.get_running_loop()
+
+    try:
+        output = await loop.run_in_executor(
+            SWARM_PROCS, _do_swarm, patient_case
+        )
+
+        # Save run details
+        await loop.run_in_executor(
+            None, _save_run, run_id, patient_case.patient_id, output
+        )
+
+        logger.info(
+            "Task completed successfully with run_id={}.", run_id
+        )
+        return ORJSONResponse({"run_id": run_id, "output": output})
+
+    except Exception as e:
+        logger.error("Error occurred while running the task: {}", e)
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while processing the task.",
+        )
+
+
+@app.post(
+    "/run/batch/",
+    status_code=202,
+    response_model=BatchResponse,
+    summary="Run batched medical coding tasks",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": PATIENT_CASES_SCHEMA}
+            },
+        }
+    },
+)
+async def run_batch(request: Request):
+    """
+    Schedules multiple medical coding tasks in batch mode. Progress of
+    each returned run ID is available from /runs/{run_id}/status, and
+    results from /history/ once the run completes.
+    """
+    logger.info("Scheduling a batch of medical coding tasks.")
+    try:
+        patient_cases = PATIENT_CASES_ADAPTER.validate_json(
+            await request.body()
+        )
+    except ValidationError as e:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors()
+            ]
+        )
+
+    run_ids = [str(uuid7()) for _ in patient_cases]
+    await asyncio.get_running_loop().run_in_executor(
+        None,
+        _mark_pending,
+        run_ids,
+        [case.patient_id for case in patient_cases],
+    )
+    job = scheduler.add_job(
+        process_batch,
+        args=[
+            run_ids,
+            [case.model_dump() for case in patient_cases],
+        ],
+        misfire_grace_time=None,
+    )
+    logger.info("Batch scheduled with job_id={}.", job.id)
+    return BatchResponse(job_id=job.id, run_ids=run_ids)
 
 
 @app.get("/history/", summary="Query patient case and run history")
-def query_history(run_query: RunQuery, db: Session = Depends(get_db)):
+def query_history(
+    run_query: RunQuery,
+    request: Request,
+    db: Session = Depends(get_read_db),
+):
     """
     Query the history of patient cases and run outputs based on run ID or patient ID.
     """
     logger.info("Querying patient case and run history.")
+    if run_query.run_id:
+        cache_key = ("run_id", run_query.run_id)
+    else:
+        cache_key = ("patient_id", run_query.patient_id)
+
+    with HISTORY_CACHE_LOCK:
+        cached = HISTORY_CACHE.get(cache_key)
+        version = history_version
+    if cached:
+        logger.info("Serving cached history for {}.", cache_key)
+        return etag_response(request, *cached)
+
     if run_query.run_id:
         run_record = (
-            db.query(RunRecord)
+            db.query(
+                RunRecord.id,
+                RunRecord.run_id,
+                RunRecord.patient_id,
+                func.length(RunRecord.output).label("size"),
+            )
             .filter(RunRecord.run_id == run_query.run_id)
             .first()
         )
         if run_record:
-            logger.info(f"Run found for run_id={run_query.run_id}.")
-            return {
-                "run_id": run_record.run_id,
-                "patient_id": run_record.patient_id,
-                "output": run_record.output,
-            }
+            logger.info("Run found for run_id={}.", run_query.run_id)
+            if run_record.size > STREAM_OUTPUT_THRESHOLD and hasattr(
+                sqlite3.Connection, "blobopen"
+            ):
+                return StreamingResponse(
+                    stream_run_output(
+                        run_record.id,
+                        run_record.run_id,
+                        run_record.patient_id,
+                    ),
+                    media_type="application/json",
+                )
+
+            output = (
+                db.query(RunRecord.output)
+                .filter(RunRecord.id == run_record.id)
+                .scalar()
+            )
+            return cache_history(
+                request,
+                cache_key,
+                {
+                    "run_id": run_record.run_id,
+                    "patient_id": run_record.patient_id,
+                    "output": decompress_output(output),
+                },
+                version,
+            )
         else:
-            logger.warning(f"Run ID {run_query.run_id} not found.")
+            logger.warning("Run ID {} not found.", run_query.run_id)
             raise HTTPException(
                 status_code=404, detail="Run ID not found."
             )
@@ -226,19 +785,25 @@ def query_history(run_query: RunQuery, db: Session = Depends(get_db)):
         )
         if results:
             logger.info(
-                f"Runs found for patient_id={run_query.patient_id}."
+                "Runs found for patient_id={}.", run_query.patient_id
+            )
+            return cache_history(
+                request,
+                cache_key,
+                [
+                    {
+                        "run_id": record.run_id,
+                        "patient_id": record.patient_id,
+                        "output": record.output_dict,
+                    }
+                    for record in results
+                ],
+                version,
             )
-            return [
-                {
-                    "run_id": record.run_id,
-                    "patient_id": record.patient_id,
-                    "output": record.output,
-                }
-                for record in results
-            ]
         else:
             logger.warning(
-                f"No runs found for patient_id={run_query.patient_id}."
+                "No runs found for patient_id={}.",
+                run_query.patient_id,
             )
             raise HTTPException(
                 status_code=404,
@@ -252,31 +817,91 @@ def query_history(run_query: RunQuery, db: Session = Depends(get_db)):
     )
 
 
+@app.get(
+    "/runs/{run_id}/status",
+    response_model=RunStatusResponse,
+    summary="Get the status of a run",
+)
+def get_run_status(run_id: str, db: Session = Depends(get_read_db)):
+    """
+    Reports whether a run is still pending, completed or failed.
+    """
+    completed = (
+        db.query(RunRecord.id)
+        .filter(RunRecord.run_id == run_id)
+        .first()
+    )
+    if completed:
+        return RunStatusResponse(run_id=run_id, status="completed")
+
+    run_status = db.get(RunStatus, run_id)
+    if run_status:
+        return RunStatusResponse(
+            run_id=run_id,
+            status=run_status.status,
+            error=run_status.error,
+        )
+
+    logger.warning("Run ID {} not found.", run_id)
+    raise HTTPException(status_code=404, detail="Run ID not found.")
+
+
 @app.get("/runs/", summary="List all runs")
-def list_all_runs(db: Session = Depends(get_db)):
+def list_all_runs(
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum runs to return."
+    ),
+    offset: int = Query(
+        0, ge=0, description="Number of runs to skip."
+    ),
+):
     """
-    List all medical coding runs with their details.
+    List medical coding runs with their details, one page at a time.
     """
     logger.info("Listing all runs.")
-    runs = db.query(RunRecord).all()
-    return [
-        {
-            "run_id": record.run_id,
-            "patient_id": record.patient_id,
-            "output": record.output,
-        }
-        for record in runs
-    ]
+
+    def stream_runs():
+        # The session lives inside the generator so it stays open for
+        # as long as the response is being streamed.
+        with ReadSessionLocal() as db:
+            runs = (
+                db.query(RunRecord)
+                .order_by(RunRecord.id)
+                .offset(offset)
+                .limit(limit)
+                .yield_per(100)
+            )
+            yield b"["
+            for i, record in enumerate(runs):
+                if i:
+                    yield b","
+                yield orjson.dumps(
+                    {
+                        "run_id": record.run_id,
+                        "patient_id": record.patient_id,
+                        "output": record.output_dict,
+                    }
+                )
+            yield b"]"
+
+    return StreamingResponse(
+        stream_runs(), media_type="application/json"
+    )
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    logger.add(
-        "medical_coder_api.log",
-        rotation="1 MB",
-        retention="7 days",
-        level="INFO",
-    )
     logger.info("Starting Medical Coder Swarm API.")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # A single server process: the /history/ cache and the in-memory
+    # batch jobs are process-local, and startup marks any pending batch
+    # run as interrupted. Swarm work for /run/ and /run/batch/ still
+    # spreads across cores through SWARM_PROCS.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        log_level="info",
+    )
@@ -205,13 +205,11 @@ class MedicalCoderSwarm:
         self.description = description
         self.agents = agents
         self.flow = flow
-        self.patient_id = patient_id
-        self.max_loops = max_loops
         self.output_type = output_type
         self.output_folder_path = output_folder_path
-        self.patient_documentation = patient_documentation
-        self.agent_outputs = agent_outputs
-        self.agent_outputs = []
+        self._set_patient(
+            patient_id, max_loops, patient_documentation
+        )
 
         self.diagnosis_system = AgentRearrange(
             name="Medical-coding-diagnosis-swarm",
@@ -224,8 +222,44 @@ class MedicalCoderSwarm:
             **kwargs,
         )
 
+    def _set_patient(
+        self,
+        patient_id: str,
+        max_loops: int,
+        patient_documentation: str,
+    ):
+        """
+        Sets the per-patient state shared by construction and reset.
+        """
+        self.patient_id = patient_id
+        self.max_loops = max_loops
+        self.patient_documentation = patient_documentation
+        self.agent_outputs = []
         self.output_file_path = (
-            f"medical_diagnosis_report_{patient_id}.md",
+            f"medical_diagnosis_report_{patient_id}.md"
+        )
+
+    def reset(
+        self,
+        patient_id: str,
+        max_loops: int = 1,
+        patient_documentation: str = None,
+    ):
+        """
+        Re-targets the swarm at a new patient so the same instance can be
+        reused across runs without rebuilding its agents.
+
+        Args:
+            patient_id (str): The patient the next run is for.
+            max_loops (int): Maximum number of loops for the next run.
+            patient_documentation (str): Documentation for the patient.
+        """
+        self._set_patient(
+            patient_id, max_loops, patient_documentation
+        )
+        # Same normalization AgentRearrange applies at construction.
+        self.diagnosis_system.max_loops = (
+            max_loops if max_loops > 0 else 1
         )
 
     def run(self, task: str = None, img: str = None, *args, **kwargs):
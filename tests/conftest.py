@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import types
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+class StubMedicalCoderSwarm:
+    """
+    Stands in for the real swarm so the API can be exercised without
+    any model calls. A patient ID of "bad" makes the run fail.
+    """
+
+    def __init__(self, **kwargs):
+        self.reset(kwargs.get("patient_id"))
+
+    def reset(
+        self, patient_id, max_loops=1, patient_documentation=None
+    ):
+        self.patient_id = patient_id
+        self.patient_documentation = patient_documentation
+
+    def run(self, task):
+        if self.patient_id == "bad":
+            raise RuntimeError("stub swarm failure")
+
+    def to_dict(self):
+        return {
+            "patient_id": self.patient_id,
+            "documentation": self.patient_documentation,
+        }
+
+
+# main imports mcs.main at module level, which pulls in the swarms
+# stack; swap in the stub before it is imported.
+_mcs = types.ModuleType("mcs")
+_mcs.main = types.ModuleType("mcs.main")
+_mcs.main.MedicalCoderSwarm = StubMedicalCoderSwarm
+sys.modules["mcs"] = _mcs
+sys.modules["mcs.main"] = _mcs.main
+
+# The database and log file paths are relative, so keep them out of
+# the working tree.
+os.chdir(tempfile.mkdtemp())
+
+import main  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    with main.WriteSessionLocal() as db:
+        db.execute(delete(main.RunRecord))
+        db.execute(delete(main.RunStatus))
+        db.commit()
+    with main.HISTORY_CACHE_LOCK:
+        main.HISTORY_CACHE.clear()
+    yield
+
+
+@pytest.fixture
+def client():
+    # Used without a `with` block so the startup hooks (logging sink,
+    # scheduler) stay out of tests that don't need them.
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def get_history(client):
+    # /history/ takes its query as a JSON body on a GET.
+    def get(headers=None, **query):
+        return client.request(
+            "GET", "/history/", json=query, headers=headers
+        )
+
+    return get
@@ -0,0 +1,71 @@
+import main
+
+
+def test_etag_round_trip(get_history):
+    main._save_run("run-1", "patient-1", {"codes": ["A00"]})
+
+    first = get_history(run_id="run-1")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert ("run_id", "run-1") in main.HISTORY_CACHE
+
+    cached = get_history(
+        run_id="run-1", headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+    stale = get_history(
+        run_id="run-1", headers={"If-None-Match": '"stale"'}
+    )
+    assert stale.status_code == 200
+    assert stale.json() == first.json()
+
+
+def test_save_run_drops_patient_entry(get_history):
+    main._save_run("run-1", "patient-1", {"codes": ["A00"]})
+    assert len(get_history(patient_id="patient-1").json()) == 1
+    assert ("patient_id", "patient-1") in main.HISTORY_CACHE
+
+    main._save_run("run-2", "patient-1", {"codes": ["B00"]})
+    assert ("patient_id", "patient-1") not in main.HISTORY_CACHE
+
+    runs = get_history(patient_id="patient-1").json()
+    assert [run["run_id"] for run in runs] == ["run-1", "run-2"]
+
+
+def test_write_during_read_is_not_cached(get_history, monkeypatch):
+    main._save_run("run-1", "patient-1", {"codes": ["A00"]})
+
+    # Land a write for the same patient after the handler has missed
+    # the cache and read its rows, but before it stores the result.
+    decompress_output = main.decompress_output
+    writes = []
+
+    def decompress_with_write(data):
+        if not writes:
+            writes.append(True)
+            main._save_run("run-2", "patient-1", {"codes": ["B00"]})
+        return decompress_output(data)
+
+    monkeypatch.setattr(
+        main, "decompress_output", decompress_with_write
+    )
+
+    stale = get_history(patient_id="patient-1").json()
+    assert [run["run_id"] for run in stale] == ["run-1"]
+    assert ("patient_id", "patient-1") not in main.HISTORY_CACHE
+
+    runs = get_history(patient_id="patient-1").json()
+    assert [run["run_id"] for run in runs] == ["run-1", "run-2"]
+
+
+def test_oversized_body_is_not_cached(get_history, monkeypatch):
+    monkeypatch.setattr(main, "HISTORY_CACHE_BYTES", 16)
+    main._save_run("run-1", "patient-1", {"codes": ["A00"]})
+
+    response = get_history(run_id="run-1")
+    assert response.status_code == 200
+    assert response.json()["output"] == {"codes": ["A00"]}
+    assert ("run_id", "run-1") not in main.HISTORY_CACHE
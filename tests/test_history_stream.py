@@ -0,0 +1,64 @@
+import os
+import sqlite3
+
+import orjson
+import pytest
+
+import main
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(sqlite3.Connection, "blobopen"),
+    reason="SQLite incremental BLOB I/O needs Python 3.11+",
+)
+
+OUTPUT = {
+    "codes": ["A00", "B00"],
+    "notes": [os.urandom(512).hex() for _ in range(8)],
+}
+
+
+def stream_and_load(get_history, monkeypatch, run_id):
+    """
+    Fetches a run once in memory and once streamed, with small chunks
+    so the stream spans several BLOB reads.
+    """
+    in_memory = get_history(run_id=run_id)
+    assert in_memory.status_code == 200
+    assert "etag" in in_memory.headers
+
+    with main.HISTORY_CACHE_LOCK:
+        main.HISTORY_CACHE.clear()
+    monkeypatch.setattr(main, "STREAM_OUTPUT_THRESHOLD", 256)
+    monkeypatch.setattr(main, "BLOB_CHUNK_SIZE", 64)
+
+    streamed = get_history(run_id=run_id)
+    assert streamed.status_code == 200
+    # Streamed responses are not cached and carry no ETag.
+    assert "etag" not in streamed.headers
+    return in_memory.json(), orjson.loads(streamed.content)
+
+
+def test_streamed_compressed_output(get_history, monkeypatch):
+    main._save_run("run-1", "patient-1", OUTPUT)
+
+    in_memory, streamed = stream_and_load(
+        get_history, monkeypatch, "run-1"
+    )
+    assert streamed == in_memory
+    assert streamed["output"] == OUTPUT
+
+
+def test_streamed_legacy_output(get_history, monkeypatch):
+    # Rows written before compression hold the output as JSON text.
+    with main.write_engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO runs (run_id, patient_id, output)"
+            " VALUES (?, ?, ?)",
+            ("run-1", "patient-1", orjson.dumps(OUTPUT).decode()),
+        )
+
+    in_memory, streamed = stream_and_load(
+        get_history, monkeypatch, "run-1"
+    )
+    assert streamed == in_memory
+    assert streamed["output"] == OUTPUT